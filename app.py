@@ -1,18 +1,30 @@
 # app.py (tasks service - production-ready, CORS + Auth0 JWKS + logs)
 import os
+import re
+import sys
+import json
 import time
 import logging
-from functools import wraps
+import queue
+import threading
+from itertools import islice
 
+import orjson
 from dotenv import load_dotenv
-from flask import Flask, request, jsonify, make_response
+from flask import Flask, request, jsonify, make_response, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_pymongo import PyMongo
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.int64 import Int64
 from bson.objectid import ObjectId
-from pymongo import ReturnDocument
-from jose import jwt
-import requests
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, ReplaceOne, ReturnDocument, WriteConcern
+from pymongo.errors import InvalidOperation, OperationFailure
 from flask_cors import CORS
 
+from auth import requires_auth_api
+
 # Optional: RabbitMQ publisher
 try:
     import pika
@@ -22,16 +34,60 @@ except Exception:
 # Load env
 load_dotenv()
 
-# Logger
-logging.basicConfig(level=logging.DEBUG)
+# Logger (LOG_LEVEL via env; DEBUG loga corpo/headers de cada requisição)
+logging.basicConfig(level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO))
 logger = logging.getLogger("tasks-app")
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Provider JSON do Flask usando orjson (extensão C) no lugar da stdlib."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=str).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+
+def fast_json(obj, status=200):
+    """Resposta JSON serializada direto com orjson, sem passar pelo jsonify."""
+    return Response(orjson.dumps(obj, default=str), status=status, mimetype="application/json")
 
 # -------------------------
 # App config
 # -------------------------
-app.config["MONGO_URI"] = os.getenv("MONGO_URI", "mongodb://localhost:27017/tasksdb")
+def _with_mongo_pool_options(uri):
+    """
+    Anexa opções de pool/timeout/compressão à MONGO_URI, sem sobrescrever
+    o que já estiver definido explicitamente na URI do ambiente.
+    """
+    defaults = (
+        # cada worker gunicorn tem o próprio pool; com gevent um único
+        # processo multiplexa centenas de greenlets sobre essas conexões
+        "maxPoolSize=200",
+        "minPoolSize=20",
+        "maxIdleTimeMS=60000",
+        # fila de espera curta: melhor falhar rápido do que enfileirar
+        # requisições atrás de um pool saturado
+        "waitQueueTimeoutMS=500",
+        "serverSelectionTimeoutMS=2000",
+        "compressors=zstd",
+        "retryWrites=true",
+        "w=1",
+    )
+    lowered = uri.lower()
+    extra = "&".join(p for p in defaults if p.split("=")[0].lower() + "=" not in lowered)
+    if not extra:
+        return uri
+    return uri + ("&" if "?" in uri else "?") + extra
+
+
+app.config["MONGO_URI"] = _with_mongo_pool_options(
+    os.getenv("MONGO_URI", "mongodb://localhost:27017/tasksdb")
+)
 app.config["AUTH0_DOMAIN"] = os.getenv("AUTH0_DOMAIN")
 app.config["AUTH0_AUDIENCE"] = os.getenv("API_AUDIENCE") or os.getenv("AUTH0_AUDIENCE")
 
@@ -40,126 +96,75 @@ FRONTEND_ORIGINS = os.getenv("FRONTEND_ORIGINS", "http://localhost:5173")
 if FRONTEND_ORIGINS.strip() == "*":
     cors_origins = "*"
 else:
-    cors_origins = [o.strip() for o in FRONTEND_ORIGINS.split(",") if o.strip()]
+    # dedup preservando ordem: flask-cors varre essa lista a cada Origin
+    cors_origins = list(dict.fromkeys(o.strip() for o in FRONTEND_ORIGINS.split(",") if o.strip()))
+
+# Configuração CORS estática, montada uma vez no startup
+_CORS_METHODS = ["GET", "POST", "PUT", "DELETE", "OPTIONS"]
+_CORS_ALLOW_HEADERS = ["Content-Type", "Authorization", "Accept"]
+_CORS_EXPOSE_HEADERS = ["Content-Type"]
+_CORS_MAX_AGE = 3600  # browsers cacheiam o preflight por 1h
 
 # Initialize CORS with full configuration
 CORS(app,
      resources={r"/*": {"origins": cors_origins}},
      supports_credentials=True,
-     allow_headers=["Content-Type", "Authorization", "Accept"],
-     expose_headers=["Content-Type"],
-     methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
+     allow_headers=_CORS_ALLOW_HEADERS,
+     expose_headers=_CORS_EXPOSE_HEADERS,
+     methods=_CORS_METHODS,
+     max_age=_CORS_MAX_AGE)
 
+# Auth centralizada em auth.py: caches de JWKS/token são singletons de
+# módulo lá, compartilhados por qualquer blueprint que importe o decorator.
 # -------------------------
-# Auth0 / JWKS config
+# DB
 # -------------------------
-AUTH0_DOMAIN = app.config.get("AUTH0_DOMAIN")
-AUTH0_AUDIENCE = app.config.get("AUTH0_AUDIENCE")
-ALGORITHMS = ["RS256"]
-
-# JWKS cache
-_JWKS_CACHE = {"fetched_at": 0, "jwks": None, "ttl": 3600}
-
-
-def _get_jwks():
-    if not AUTH0_DOMAIN:
-        raise RuntimeError("AUTH0_DOMAIN não configurado (ver .env)")
-    now = time.time()
-    if _JWKS_CACHE["jwks"] and now - _JWKS_CACHE["fetched_at"] < _JWKS_CACHE["ttl"]:
-        return _JWKS_CACHE["jwks"]
-    jwks_url = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json"
-    r = requests.get(jwks_url, timeout=5)
-    r.raise_for_status()
-    jwks = r.json()
-    _JWKS_CACHE.update({"jwks": jwks, "fetched_at": now})
-    return jwks
+mongo = PyMongo(app)
 
 
 # -------------------------
-# Helpers / Auth decorator
+# Índices (no startup, uma vez por worker)
 # -------------------------
-def requires_auth_api(required_scope: str = None):
-    """
-    Decorator to require a Bearer access token (Auth0).
-    If required_scope is provided, also checks that scope exists in token.
-    Bypasses authentication when app.config['TESTING'] is True.
-    """
-    def decorator(f):
-        @wraps(f)
-        def decorated(*args, **kwargs):
-            # Bypass authentication in test mode
-            if app.config.get("TESTING"):
-                request.current_user = {"sub": "test-user"}
-                return f(*args, **kwargs)
-
-            auth = request.headers.get("Authorization", None)
-            if not auth:
-                return jsonify({"error": "Authorization header missing"}), 401
-
-            parts = auth.split()
-            if parts[0].lower() != "bearer" or len(parts) != 2:
-                return jsonify({"error": "Invalid Authorization header"}), 401
-            token = parts[1]
-
-            try:
-                unverified_header = jwt.get_unverified_header(token)
-            except Exception:
-                return jsonify({"error": "Invalid token header"}), 401
-
-            try:
-                jwks = _get_jwks()
-            except Exception as e:
-                logger.exception("Failed to fetch JWKS")
-                # Se JWKS falhar e já tivermos cache vazio — erro 500
-                return jsonify({"error": f"Erro ao buscar JWKS: {str(e)}"}), 500
-
-            rsa_key = {}
-            for key in jwks.get("keys", []):
-                if key.get("kid") == unverified_header.get("kid"):
-                    rsa_key = {
-                        "kty": key.get("kty"),
-                        "kid": key.get("kid"),
-                        "use": key.get("use"),
-                        "n": key.get("n"),
-                        "e": key.get("e")
-                    }
-                    break
-
-            if not rsa_key:
-                return jsonify({"error": "Appropriate JWK not found"}), 401
-
-            try:
-                payload = jwt.decode(
-                    token,
-                    rsa_key,
-                    algorithms=ALGORITHMS,
-                    audience=AUTH0_AUDIENCE,
-                    issuer=f"https://{AUTH0_DOMAIN}/"
-                )
-            except jwt.ExpiredSignatureError:
-                return jsonify({"error": "Token expired"}), 401
-            except Exception as e:
-                logger.warning("Token validation error: %s", e)
-                return jsonify({"error": f"Token inválido: {str(e)}"}), 401
-
-            # scope check (optional)
-            if required_scope:
-                scopes = payload.get("scope", "")
-                scopes_list = scopes.split() if isinstance(scopes, str) else []
-                if required_scope not in scopes_list:
-                    return jsonify({"error": "Insufficient scope"}), 403
-
-            # attach claims
-            request.current_user = payload
-            return f(*args, **kwargs)
-        return decorated
-    return decorator
+# A listagem filtra por owner e ordena por _id desc; sem índice composto isso
+# vira COLLSCAN + SORT em memória quando a coleção cresce. create_index é
+# idempotente; cada worker dispara a criação em background no boot, fora do
+# caminho das requisições — num primeiro deploy contra uma coleção grande o
+# build pode demorar mais que o timeout de worker do gunicorn, então nenhuma
+# requisição pode ficar esperando por ele.
+_LIST_INDEX = [("owner", 1), ("_id", -1)]
+_INDEXES_READY = False
+_INDEXES_LOCK = threading.Lock()
+
+
+def _ensure_indexes():
+    global _INDEXES_READY
+    if _INDEXES_READY:
+        return
+    # não bloqueia: enquanto um chamador constrói, os demais seguem sem o
+    # hint em vez de enfileirar atrás do build
+    if not _INDEXES_LOCK.acquire(blocking=False):
+        return
+    try:
+        if _INDEXES_READY:
+            return
+        try:
+            mongo.db.tarefas.create_index(_LIST_INDEX)
+            mongo.db.task_snapshots.create_index([("owner", 1), ("status", 1)])
+        except Exception as e:
+            logger.warning("Falha ao criar índices compostos: %s", e)
+            return
+        _INDEXES_READY = True
+    finally:
+        _INDEXES_LOCK.release()
 
 
-# -------------------------
-# DB
-# -------------------------
-mongo = PyMongo(app)
+# Dispara o build no boot do worker; _ensure_indexes continua nas rotas só
+# como rede de segurança para quando o Mongo sobe depois do app (a thread
+# morre no primeiro erro, o retry fica por conta das requisições). Sob
+# pytest a thread só faria barulho: o mongomock é injetado depois do
+# import e a rede de segurança nas rotas cobre os testes.
+if "pytest" not in sys.modules:
+    threading.Thread(target=_ensure_indexes, daemon=True).start()
 
 
 # -------------------------
@@ -185,56 +190,284 @@ def _ensure_rabbit():
         logger.warning("RabbitMQ unavailable: %s", e)
         return None
 
+# Eventos são enfileirados e publicados por uma thread em background: o
+# handler da requisição nunca bloqueia no I/O com o broker
+_EVENT_QUEUE = queue.Queue(maxsize=10000)
+
+# Properties são imutáveis e idênticas para todo evento; construir uma vez
+_EVENT_PROPERTIES = (
+    pika.BasicProperties(content_type="application/json", delivery_mode=2)
+    if pika else None
+)
+
+
 def publish_event(event_type, payload):
-    ch = _ensure_rabbit()
     event = {
         "event_id": str(ObjectId()),
         "event_type": event_type,
-        "occurred_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "occurred_at": _utc_iso(),
         "payload": payload
     }
-    if ch:
+    try:
+        _EVENT_QUEUE.put_nowait(event)
+    except queue.Full:
+        logger.warning("Fila de eventos cheia; descartando %s", event_type)
+
+
+def _event_publisher():
+    global _rabbit_channel
+    while True:
+        event = _EVENT_QUEUE.get()
+        ch = _ensure_rabbit()
+        if not ch:
+            logger.debug("No rabbit channel configured; skipping publish for %s", event["event_type"])
+            continue
         try:
             ch.basic_publish(
                 exchange="app.events",
-                routing_key=event_type,
-                body=jsonify(event).get_data(as_text=True),
-                properties=pika.BasicProperties(content_type='application/json', delivery_mode=2)
+                routing_key=event["event_type"],
+                body=orjson.dumps(event),  # pika aceita bytes direto
+                properties=_EVENT_PROPERTIES
             )
-            logger.debug("Published event %s", event_type)
+            logger.debug("Published event %s", event["event_type"])
         except Exception as e:
             logger.warning("Failed to publish event: %s", e)
-    else:
-        logger.debug("No rabbit channel configured; skipping publish for %s", event_type)
+            _rabbit_channel = None  # força reconexão no próximo evento
+
+
+if RABBITMQ_URL and pika:
+    threading.Thread(target=_event_publisher, daemon=True).start()
 
 
 # -------------------------
 # Logging
 # -------------------------
-@app.before_request
 def log_request_info():
     logger.debug("Incoming request: %s %s", request.method, request.path)
     # NÃO logar Authorization
     hdrs = {k: v for k, v in request.headers.items() if k in ("Host", "Origin", "Content-Type")}
     logger.debug("Headers: %s", hdrs)
     try:
-        logger.debug("Body preview: %s", request.get_data(as_text=True)[:1000])
+        cl = request.content_length or 0
+        if cl > 1000:
+            # corpo grande: não força leitura + decode UTF-8 de MBs só
+            # para um preview que seria truncado de qualquer jeito
+            logger.debug("Body preview: <%d bytes>", cl)
+        else:
+            logger.debug("Body preview: %s", request.get_data(as_text=True)[:1000])
     except Exception:
         pass
 
 
+# Só registra o hook quando DEBUG está ligado: sem ele o dispatcher do Flask
+# não tem nenhum before_request para iterar em produção
+if logger.isEnabledFor(logging.DEBUG):
+    app.before_request(log_request_info)
+
+
+# -------------------------
+# Helpers: leitura BSON crua (listagem)
+# -------------------------
+# Para a listagem não precisamos decodificar cada documento BSON em dict
+# só para re-serializar em JSON logo em seguida. Com RawBSONDocument o
+# driver entrega os bytes crus e nós transcodificamos direto para JSON.
+_RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+
+# Handles de collection memoizados: cada mongo.db.<nome> atravessa o
+# __getattr__ do PyMongo e cria um objeto Collection novo. A chave inclui
+# id(mongo.db) para o cache se invalidar quando os testes injetam um banco
+# mongomock; o próprio db fica retido no valor para o id não ser reusado.
+_COLL_CACHE = {}
+
+
+def _coll(name, **opts):
+    db = mongo.db
+    key = (id(db), name, frozenset(opts))
+    cached = _COLL_CACHE.get(key)
+    if cached is None:
+        cached = _COLL_CACHE[key] = (db, db.get_collection(name, **opts))
+    return cached[1]
+
+
+def _tarefas():
+    """Handle da collection de tarefas para leituras decodificadas."""
+    return _coll("tarefas")
+
+
+def _idempotency():
+    """Handle da collection de chaves de idempotência."""
+    return _coll("idempotency")
+
+
+def _tarefas_raw():
+    """Handle da collection de tarefas que devolve BSON cru (sem decode)."""
+    try:
+        return _coll("tarefas", codec_options=_RAW_CODEC_OPTIONS)
+    except NotImplementedError:
+        # mongomock (testes) não suporta document_class customizado
+        return _tarefas()
+
+
+# Pré-validação de ObjectId: checar 24 hex dígitos com regex e construir a
+# partir dos bytes é bem mais barato que deixar ObjectId() levantar
+# InvalidId (alocação de frame + traceback) em cada ID malformado
+_OID_RE = re.compile(r"^[0-9a-fA-F]{24}$")
+
+
+def _parse_oid(id):
+    """ObjectId a partir de um id da URL, ou None se não for 24 hex dígitos."""
+    if not _OID_RE.match(id):
+        return None
+    return ObjectId(bytes.fromhex(id))
+
+
+def _now_ms():
+    """
+    Epoch em milissegundos como Int64 — um syscall, sem struct_time/strftime.
+    Gravado em paralelo aos campos ISO (criado_em/atualizado_em) durante a
+    janela de migração; consultas por $gt funcionam igual.
+    """
+    return Int64(time.time_ns() // 1_000_000)
+
+
+def _utc_iso():
+    """Timestamp UTC ISO-8601 (precisão de segundos), sem passar por strftime."""
+    t = time.gmtime()
+    return (
+        f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}"
+        f"T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}Z"
+    )
+
+# Write concern explícito nos inserts: w=1 devolve no ack do primário sem
+# esperar commit de journal, dentro do SLA de um app de lista de tarefas.
+# Ops pode reativar o journal com WRITE_CONCERN_J=true em deploys críticos.
+_WRITE_CONCERN_J = os.getenv("WRITE_CONCERN_J", "false").lower() == "true"
+_TAREFAS_WRITE_CONCERN = WriteConcern(w=1, j=_WRITE_CONCERN_J)
+
+
+def _tarefas_write():
+    """Handle da collection de tarefas para escrita, com write concern explícito."""
+    return _coll("tarefas", write_concern=_TAREFAS_WRITE_CONCERN)
+
+
+# Snapshot é uma view derivada, reconstruível a partir de tarefas: w=0
+# (fire-and-forget) devolve sem esperar ack do primário e tira a escrita
+# secundária do caminho crítico da requisição.
+_SNAPSHOT_WRITE_CONCERN = WriteConcern(w=0)
+
+
+def _snapshots_write():
+    """Handle de task_snapshots para escrita, sem esperar ack (w=0)."""
+    return _coll("task_snapshots", write_concern=_SNAPSHOT_WRITE_CONCERN)
+
+
+# bulk_write no nível do cliente (MongoDB 8.0+) cobre tarefa + snapshot em um
+# único round-trip; na primeira indisponibilidade (servidor antigo, mongomock)
+# o flag desarma e as escritas voltam a ser sequenciais
+_CLIENT_BULK = True
+
+
+def _tarefa_row_json(t):
+    """Serializa um documento de tarefa (já decodificado) no formato da API."""
+    # criar_tarefa sempre grava os três campos; subscript direto evita o
+    # method call de dict.get por campo. Docs legados caem no caminho lento.
+    try:
+        row = {
+            "id": str(t["_id"]),
+            "titulo": t["titulo"],
+            "descricao": t["descricao"],
+            "concluida": t["concluida"]
+        }
+    except KeyError:
+        row = {
+            "id": str(t["_id"]),
+            "titulo": t.get("titulo"),
+            "descricao": t.get("descricao"),
+            "concluida": t.get("concluida", False)
+        }
+    return json.dumps(row, default=json_util.default).encode("utf-8")
+
+
+def _tarefa_raw_json(doc):
+    """
+    Transcodifica um documento BSON cru direto para JSON (bytes).
+    Percorre a tabela de elementos (tag de 1 byte + chave cstring + valor)
+    extraindo só os campos da resposta; qualquer tipo inesperado cai no
+    caminho lento via json_util.
+    """
+    if not isinstance(doc, RawBSONDocument):
+        return _tarefa_row_json(doc)
+    data = doc.raw
+    oid = titulo = descricao = None
+    concluida = b"false"
+    pos = 4
+    end = len(data) - 1
+    try:
+        while pos < end:
+            tag = data[pos]
+            pos += 1
+            knul = data.index(0, pos)
+            key = data[pos:knul]
+            pos = knul + 1
+            if tag == 0x07:  # ObjectId: 12 bytes
+                value = b'"' + data[pos:pos + 12].hex().encode("ascii") + b'"'
+                pos += 12
+            elif tag == 0x02:  # string: int32 len + utf8 + NUL
+                slen = int.from_bytes(data[pos:pos + 4], "little")
+                pos += 4
+                value = json.dumps(
+                    data[pos:pos + slen - 1].decode("utf-8"),
+                    ensure_ascii=False
+                ).encode("utf-8")
+                pos += slen
+            elif tag == 0x08:  # bool
+                value = b"true" if data[pos] else b"false"
+                pos += 1
+            elif tag == 0x0A:  # null
+                value = b"null"
+            else:
+                # A projeção só devolve os campos da resposta, então
+                # qualquer outro tipo (número, data...) é um valor real de
+                # um deles — decodifica em vez de pular e reportar errado
+                raise ValueError("tipo BSON não tratado: %#x" % tag)
+
+            if key == b"_id":
+                oid = value
+            elif key == b"titulo":
+                titulo = value
+            elif key == b"descricao":
+                descricao = value
+            elif key == b"concluida":
+                concluida = value
+    except Exception:
+        # Documento fora do esperado — decodifica e usa json_util
+        return _tarefa_row_json(dict(doc))
+
+    buf = bytearray(b'{"id":')
+    buf += oid if oid else b"null"
+    buf += b',"titulo":'
+    buf += titulo if titulo else b"null"
+    buf += b',"descricao":'
+    buf += descricao if descricao else b"null"
+    buf += b',"concluida":'
+    buf += concluida
+    buf += b"}"
+    return bytes(buf)
+
+
 # -------------------------
 # Helpers: idempotency util
 # -------------------------
 def get_idempotency_record(collection_name, idempotency_key):
     if not idempotency_key:
         return None
-    return mongo.db.idempotency.find_one({"collection": collection_name, "idempotency_key": idempotency_key})
+    return _idempotency().find_one({"collection": collection_name, "idempotency_key": idempotency_key})
 
 def save_idempotency_record(collection_name, idempotency_key, resource):
     if not idempotency_key:
         return
-    mongo.db.idempotency.replace_one(
+    _idempotency().replace_one(
         {"collection": collection_name, "idempotency_key": idempotency_key},
         {"collection": collection_name, "idempotency_key": idempotency_key, "resource": resource},
         upsert=True
@@ -246,30 +479,68 @@ def save_idempotency_record(collection_name, idempotency_key, resource):
 # -------------------------
 @app.route("/health", methods=["GET"])
 def health():
-    return jsonify({"status": "ok", "service": "tasks"}), 200
+    return fast_json({"status": "ok", "service": "tasks"})
 
 @app.route("/ready", methods=["GET"])
 def ready():
     try:
         mongo.db.command("ping")
-        return jsonify({"ready": True}), 200
+        return fast_json({"ready": True})
     except Exception:
-        return jsonify({"ready": False}), 503
+        return fast_json({"ready": False}, status=503)
 
 
 @app.route("/tarefas", methods=["GET"])
 @requires_auth_api()
 def listar_tarefas():
-    tarefas = mongo.db.tarefas.find()
-    out = []
-    for t in tarefas:
-        out.append({
-            "id": str(t["_id"]),
-            "titulo": t.get("titulo"),
-            "descricao": t.get("descricao"),
-            "concluida": t.get("concluida", False)
-        })
-    return jsonify(out), 200
+    _ensure_indexes()
+
+    # Paginação por cursor: O(página) em vez de O(coleção). A listagem é
+    # por dono, mais recente primeiro (_id embute o timestamp de criação)
+    try:
+        limit = max(1, min(int(request.args.get("limit", 100)), 500))
+    except ValueError:
+        return jsonify({"error": "Parâmetro 'limit' inválido"}), 400
+
+    filtro = {"owner": request.current_user.get("sub")}
+    after = request.args.get("after")
+    if after:
+        if not _OID_RE.match(after):
+            return jsonify({"error": "Cursor 'after' inválido"}), 400
+        filtro["_id"] = {"$lt": ObjectId(bytes.fromhex(after))}
+
+    # Projeção explícita: só os campos da resposta trafegam do Mongo,
+    # e batches maiores reduzem round-trips de getMore em coleções grandes
+    tarefas = _tarefas_raw().find(
+        filtro,
+        projection={"titulo": 1, "descricao": 1, "concluida": 1},
+        batch_size=500
+    ).sort("_id", -1).limit(limit)
+    if _INDEXES_READY:
+        # range scan no índice composto, sem estágio de SORT bloqueante
+        tarefas = tarefas.hint(_LIST_INDEX)
+
+    # Resposta em streaming: cada lote do cursor vira um chunk (map + join
+    # mantêm o loop por documento no runtime C) e o RSS fica constante
+    # independentemente do tamanho da página
+    def gerar():
+        yield b'{"tarefas":['
+        total = 0
+        ultima = None
+        sep = b""
+        it = iter(tarefas)
+        while True:
+            lote = list(islice(it, 500))
+            if not lote:
+                break
+            total += len(lote)
+            ultima = lote[-1]
+            yield sep + b",".join(map(_tarefa_raw_json, lote))
+            sep = b","
+        next_cursor = str(ultima["_id"]) if total == limit and ultima is not None else None
+        yield b'],"next_cursor":' + orjson.dumps(next_cursor) + b"}"
+
+    return Response(stream_with_context(gerar()), mimetype="application/json")
 
 
 @app.route("/tarefas/<id>", methods=["GET"])
@@ -279,16 +550,15 @@ def obter_tarefa(id):
     Busca uma tarefa individual por ID.
     Usado pelo Reports service para validar task_ids.
     """
-    try:
-        obj_id = ObjectId(id)
-    except Exception:
+    obj_id = _parse_oid(id)
+    if obj_id is None:
         return jsonify({"error": "ID inválido"}), 400
-    
-    tarefa = mongo.db.tarefas.find_one({"_id": obj_id})
+
+    tarefa = _tarefas().find_one({"_id": obj_id})
     if not tarefa:
         return jsonify({"error": "Tarefa não encontrada"}), 404
     
-    return jsonify({
+    return fast_json({
         "id": str(tarefa["_id"]),
         "titulo": tarefa.get("titulo"),
         "descricao": tarefa.get("descricao"),
@@ -296,7 +566,7 @@ def obter_tarefa(id):
         "owner": tarefa.get("owner"),
         "criado_em": tarefa.get("criado_em"),
         "atualizado_em": tarefa.get("atualizado_em")
-    }), 200
+    })
 
 
 @app.route("/tarefas", methods=["POST"])
@@ -309,32 +579,64 @@ def criar_tarefa():
     idempotency_key = request.headers.get("Idempotency-Key")
     existing = get_idempotency_record("tarefas", idempotency_key)
     if existing:
-        return jsonify(existing["resource"]), 200
+        return fast_json(existing["resource"])
 
+    # _id pré-atribuído no cliente: o snapshot pode ser montado antes de
+    # qualquer ida ao banco
+    tarefa_id = ObjectId()
+    agora = _utc_iso()
+    agora_ms = _now_ms()
     tarefa_doc = {
+        "_id": tarefa_id,
         "titulo": dados.get("titulo", ""),  # titulo agora é opcional
         "descricao": dados["descricao"],
         "concluida": dados.get("concluida", False),
         "owner": request.current_user.get("sub") if hasattr(request, "current_user") else None,
-        "criado_em": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "atualizado_em": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        "criado_em": agora,
+        "atualizado_em": agora,
+        "criado_em_ms": agora_ms,
+        "atualizado_em_ms": agora_ms
+    }
+    # Snapshot para validações futuras por outros serviços
+    snapshot = {
+        "_id": tarefa_id,
+        "titulo": tarefa_doc["titulo"],
+        "descricao": tarefa_doc["descricao"],
+        "owner": tarefa_doc["owner"],
+        "status": "open",
+        "criado_em": tarefa_doc["criado_em"],
+        "atualizado_em": tarefa_doc["atualizado_em"]
     }
-    tarefa_id = mongo.db.tarefas.insert_one(tarefa_doc).inserted_id
 
-    # Também gravar um snapshot para validações futuras por outros serviços
-    try:
-        snapshot = {
-            "_id": tarefa_id,
-            "titulo": tarefa_doc["titulo"],
-            "descricao": tarefa_doc["descricao"],
-            "owner": tarefa_doc["owner"],
-            "status": "open",
-            "criado_em": tarefa_doc["criado_em"],
-            "atualizado_em": tarefa_doc["atualizado_em"]
-        }
-        mongo.db.task_snapshots.replace_one({"_id": tarefa_id}, snapshot, upsert=True)
-    except Exception as e:
-        logger.warning("Falha ao gravar snapshot de task: %s", e)
+    global _CLIENT_BULK
+    gravou = False
+    if _CLIENT_BULK:
+        try:
+            db_name = mongo.db.name
+            mongo.cx.bulk_write([
+                InsertOne(tarefa_doc, namespace=f"{db_name}.tarefas"),
+                ReplaceOne({"_id": tarefa_id}, snapshot, upsert=True,
+                           namespace=f"{db_name}.task_snapshots")
+            ])
+            gravou = True
+        except (AttributeError, TypeError, NotImplementedError, InvalidOperation) as e:
+            # bulk de cliente não existe neste servidor/driver (ex.:
+            # mongomock): desarma o caminho rápido de vez neste processo
+            _CLIENT_BULK = False
+            logger.info("bulk_write de cliente indisponível (%s); usando escritas sequenciais", e)
+        except OperationFailure as e:
+            # o bulk pode ter aplicado o InsertOne antes de falhar (ex.: erro
+            # transitório no ReplaceOne do snapshot); não desarma o caminho
+            # rápido e deixa o fallback idempotente abaixo regravar
+            logger.warning("bulk_write de cliente falhou (%s); refazendo com escritas sequenciais", e)
+    if not gravou:
+        # replace_one com upsert em vez de insert_one: não estoura
+        # DuplicateKeyError se o bulk acima já tiver inserido a tarefa
+        _tarefas_write().replace_one({"_id": tarefa_id}, tarefa_doc, upsert=True)
+        try:
+            _snapshots_write().replace_one({"_id": tarefa_id}, snapshot, upsert=True)
+        except Exception as e:
+            logger.warning("Falha ao gravar snapshot de task: %s", e)
 
     resource = {
         "id": str(tarefa_id),
@@ -352,16 +654,75 @@ def criar_tarefa():
 
     save_idempotency_record("tarefas", idempotency_key, resource)
 
-    return jsonify(resource), 201
+    return fast_json(resource, status=201)
+
+
+@app.route("/tarefas/bulk", methods=["POST"])
+@requires_auth_api()  # TEMPORÁRIO: scope removido para testes
+def criar_tarefas_bulk():
+    """
+    Criação em lote: aceita {"tarefas": [...]} e grava tudo em um único
+    insert_many, amortizando protocolo de wire + write concern por batch
+    em vez de N round-trips de POST /tarefas.
+    """
+    dados = request.json
+    itens = dados.get("tarefas") if isinstance(dados, dict) else None
+    if not isinstance(itens, list) or not itens:
+        return jsonify({"error": "Campo 'tarefas' deve ser uma lista não vazia"}), 400
+    if len(itens) > 1000:
+        return jsonify({"error": "Máximo de 1000 tarefas por requisição"}), 400
+    for item in itens:
+        if not isinstance(item, dict) or "descricao" not in item:
+            return jsonify({"error": "Campo 'descricao' é obrigatório em todas as tarefas"}), 400
+
+    agora = _utc_iso()
+    agora_ms = _now_ms()
+    owner = request.current_user.get("sub") if hasattr(request, "current_user") else None
+    docs = [{
+        "titulo": item.get("titulo", ""),
+        "descricao": item["descricao"],
+        "concluida": item.get("concluida", False),
+        "owner": owner,
+        "criado_em": agora,
+        "atualizado_em": agora,
+        "criado_em_ms": agora_ms,
+        "atualizado_em_ms": agora_ms
+    } for item in itens]
+
+    # ordered=False deixa o servidor paralelizar e não aborta o lote inteiro
+    # na primeira falha
+    resultado = _tarefas_write().insert_many(docs, ordered=False)
+
+    # snapshots em um único bulk_write, espelhando o POST unitário
+    try:
+        _snapshots_write().bulk_write([
+            ReplaceOne(
+                {"_id": doc["_id"]},
+                {
+                    "_id": doc["_id"],
+                    "titulo": doc["titulo"],
+                    "descricao": doc["descricao"],
+                    "owner": doc["owner"],
+                    "status": "open",
+                    "criado_em": doc["criado_em"],
+                    "atualizado_em": doc["atualizado_em"]
+                },
+                upsert=True
+            )
+            for doc in docs
+        ], ordered=False)
+    except Exception as e:
+        logger.warning("Falha ao gravar snapshots de tasks em lote: %s", e)
+
+    return fast_json({"ids": [str(i) for i in resultado.inserted_ids]}, status=201)
 
 
 @app.route("/tarefas/<id>", methods=["PUT"])
 @requires_auth_api()  # TEMPORÁRIO: scope removido para testes
 def atualizar_tarefa(id):
     dados = request.json or {}
-    try:
-        obj_id = ObjectId(id)
-    except Exception:
+    obj_id = _parse_oid(id)
+    if obj_id is None:
         return jsonify({"error": "ID inválido"}), 400
 
     update_fields = {}
@@ -372,9 +733,10 @@ def atualizar_tarefa(id):
     if "concluida" in dados:
         update_fields["concluida"] = dados["concluida"]
 
-    update_fields["atualizado_em"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    update_fields["atualizado_em"] = _utc_iso()
+    update_fields["atualizado_em_ms"] = _now_ms()
 
-    atualizada = mongo.db.tarefas.find_one_and_update(
+    atualizada = _tarefas().find_one_and_update(
         {"_id": obj_id},
         {"$set": update_fields},
         return_document=ReturnDocument.AFTER
@@ -384,7 +746,7 @@ def atualizar_tarefa(id):
 
     # atualizar snapshot também
     try:
-        mongo.db.task_snapshots.update_one({"_id": obj_id}, {"$set": {
+        _snapshots_write().update_one({"_id": obj_id}, {"$set": {
             "titulo": atualizada.get("titulo"),
             "descricao": atualizada.get("descricao"),
             "status": "open" if not atualizada.get("concluida") else "done",
@@ -393,33 +755,32 @@ def atualizar_tarefa(id):
     except Exception as e:
         logger.warning("Falha ao atualizar snapshot: %s", e)
 
-    return jsonify({
+    return fast_json({
         "id": str(atualizada["_id"]),
         "titulo": atualizada.get("titulo"),
         "descricao": atualizada.get("descricao"),
         "concluida": atualizada.get("concluida", False)
-    }), 200
+    })
 
 
 @app.route("/tarefas/<id>", methods=["DELETE"])
 @requires_auth_api()  # TEMPORÁRIO: scope removido para testes
 def deletar_tarefa(id):
-    try:
-        obj_id = ObjectId(id)
-    except Exception:
+    obj_id = _parse_oid(id)
+    if obj_id is None:
         return jsonify({"error": "ID inválido"}), 400
 
-    resultado = mongo.db.tarefas.delete_one({"_id": obj_id})
+    resultado = _tarefas().delete_one({"_id": obj_id})
     if resultado.deleted_count == 0:
         return jsonify({"error": "Tarefa não encontrada"}), 404
 
     # remover snapshot (ou marcar soft-delete conforme política)
     try:
-        mongo.db.task_snapshots.delete_one({"_id": obj_id})
+        _snapshots_write().delete_one({"_id": obj_id})
     except Exception as e:
         logger.warning("Falha ao deletar snapshot: %s", e)
 
-    return jsonify({"message": "Tarefa deletada com sucesso"}), 200
+    return fast_json({"message": "Tarefa deletada com sucesso"})
 
 
 # -------------------------
@@ -434,6 +795,14 @@ if __name__ == "__main__":
     except Exception:
         logger.warning("Falha ao criar índices iniciais")
 
-    port = int(os.getenv("PORT", os.getenv("FLASK_RUN_PORT", 5000)))
-    debug_flag = (os.getenv("FLASK_DEBUG", "false").lower() == "true")
-    app.run(host="0.0.0.0", port=port, debug=debug_flag)
+    # O servidor do Werkzeug é single-threaded e só serve para desenvolvimento;
+    # em produção usar ./run.sh (gunicorn + gevent)
+    if os.getenv("USE_DEV_SERVER", "").lower() in ("1", "true"):
+        port = int(os.getenv("PORT", os.getenv("FLASK_RUN_PORT", 5000)))
+        debug_flag = (os.getenv("FLASK_DEBUG", "false").lower() == "true")
+        app.run(host="0.0.0.0", port=port, debug=debug_flag)
+    else:
+        logger.warning(
+            "Servidor de desenvolvimento desabilitado. Use ./run.sh (gunicorn) "
+            "ou defina USE_DEV_SERVER=true para rodar app.run localmente."
+        )
@@ -0,0 +1,255 @@
+# auth.py — validação de access tokens Auth0 (JWKS + JWT), compartilhada
+# por todas as rotas. Os caches (_JWKS_CACHE, _TOKEN_CACHE, _HDR_CACHE) são
+# singletons de módulo: importar daqui garante um único cache por processo,
+# em vez de uma cópia por blueprint que multiplicaria misses e tráfego
+# contra o Auth0.
+import os
+import json
+import time
+import hashlib
+import logging
+import random
+import threading
+
+import cachetools
+from functools import wraps
+
+from dotenv import load_dotenv
+
+import jwt
+from jwt.algorithms import RSAAlgorithm
+import requests
+from flask import current_app, request, jsonify
+
+logger = logging.getLogger("tasks-app.auth")
+
+# idempotente; garante o .env carregado mesmo se este módulo for importado
+# antes do app (ex.: por um blueprint ou script avulso)
+load_dotenv()
+
+AUTH0_DOMAIN = os.getenv("AUTH0_DOMAIN")
+AUTH0_AUDIENCE = os.getenv("API_AUDIENCE") or os.getenv("AUTH0_AUDIENCE")
+ALGORITHMS = ["RS256"]
+# Constantes derivadas do domínio, montadas uma vez (nada de f-string por
+# requisição no caminho de validação)
+ISSUER = f"https://{AUTH0_DOMAIN}/" if AUTH0_DOMAIN else None
+JWKS_URL = f"https://{AUTH0_DOMAIN}/.well-known/jwks.json" if AUTH0_DOMAIN else None
+
+# JWKS cache — renovado em background para nunca bloquear uma requisição
+# no fetch HTTPS (DNS + TLS + HTTP) quando o TTL expira
+_JWKS_CACHE = {"fetched_at": 0, "jwks": None, "index": {}, "ttl": 3600}
+_JWKS_LOCK = threading.Lock()
+# Por quanto tempo um JWKS vencido ainda pode ser servido se o refresh falhar
+_JWKS_STALE_GRACE = 900
+# Session mantida aberta: pool de conexões + reaproveitamento de sessão TLS
+# (o ticket de sessão TLS faz o reconnect ao Auth0 custar um único RTT)
+_JWKS_SESSION = requests.Session()
+_JWKS_SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+
+def _fetch_jwks():
+    """Busca o JWKS no Auth0 e troca o cache atomicamente. Chamar com o lock."""
+    r = _JWKS_SESSION.get(JWKS_URL, timeout=5)
+    r.raise_for_status()
+    jwks = r.json()
+    # Índice kid -> RSAPublicKey, materializado uma vez por fetch: a
+    # validação de token faz lookup O(1) e a reconstrução JWK -> chave RSA
+    # (parse dos big-ints n/e) não se repete a cada requisição
+    index = {}
+    for k in jwks.get("keys", []):
+        kid = k.get("kid")
+        if not kid:
+            continue
+        try:
+            index[kid] = RSAAlgorithm.from_jwk(json.dumps(k))
+        except Exception as e:
+            logger.warning("JWK inválida no JWKS (kid=%s): %s", kid, e)
+    _JWKS_CACHE.update({"jwks": jwks, "index": index, "fetched_at": time.time()})
+    return jwks
+
+
+def _get_jwks():
+    if not AUTH0_DOMAIN:
+        raise RuntimeError("AUTH0_DOMAIN não configurado (ver .env)")
+    if _JWKS_CACHE["jwks"] and time.time() - _JWKS_CACHE["fetched_at"] < _JWKS_CACHE["ttl"]:
+        return _JWKS_CACHE["jwks"]
+    # double-checked locking: só um chamador paga o fetch no cold start
+    with _JWKS_LOCK:
+        if _JWKS_CACHE["jwks"] and time.time() - _JWKS_CACHE["fetched_at"] < _JWKS_CACHE["ttl"]:
+            return _JWKS_CACHE["jwks"]
+        try:
+            return _fetch_jwks()
+        except Exception:
+            # Auth0 fora do ar não deve derrubar toda a autenticação na
+            # hora: serve o cache vencido dentro do grace e falha depois
+            if _JWKS_CACHE["jwks"] and (
+                time.time() - _JWKS_CACHE["fetched_at"] < _JWKS_CACHE["ttl"] + _JWKS_STALE_GRACE
+            ):
+                logger.warning("Refresh de JWKS falhou; servindo cache vencido dentro do grace")
+                return _JWKS_CACHE["jwks"]
+            raise
+
+
+def _jwks_refresher():
+    """Renova o JWKS bem antes de expirar, fora do caminho das requisições."""
+    while True:
+        # jitter: réplicas não renovam alinhadas e não estampedam o Auth0
+        time.sleep(random.uniform(0.7, 0.9) * _JWKS_CACHE["ttl"])
+        try:
+            with _JWKS_LOCK:
+                _fetch_jwks()
+        except Exception as e:
+            logger.warning("Falha ao renovar JWKS em background: %s", e)
+
+
+if AUTH0_DOMAIN:
+    threading.Thread(target=_jwks_refresher, daemon=True).start()
+
+# Cache de payloads já verificados: clientes reenviam o mesmo access token
+# por centenas de requisições, então a verificação RSA só precisa rodar uma
+# vez por token. blake2b basta como chave — o exp é re-checado a cada hit.
+_TOKEN_CACHE = cachetools.TTLCache(maxsize=4096, ttl=300)
+_TOKEN_CACHE_LOCK = threading.Lock()
+
+# Cache do header JOSE decodificado, indexado pelo primeiro segmento do
+# token: tokens reenviados pulam o base64+json parse do header
+_HDR_CACHE = cachetools.LRUCache(maxsize=4096)
+_HDR_CACHE_LOCK = threading.Lock()
+
+
+def _token_cache_key(token):
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+class _AuthError(Exception):
+    """Falha de autenticação, com o status HTTP a devolver."""
+
+    def __init__(self, message, status=401):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def _extract_bearer(auth_header):
+    """Extrai o token do header Authorization (Bearer <token>)."""
+    if not auth_header:
+        raise _AuthError("Authorization header missing")
+    parts = auth_header.split()
+    if parts[0].lower() != "bearer" or len(parts) != 2:
+        raise _AuthError("Invalid Authorization header")
+    return parts[1]
+
+
+def _unverified_header(token):
+    """Header JOSE decodificado, via cache por segmento de header."""
+    hdr_key = token.split(".", 1)[0]
+    with _HDR_CACHE_LOCK:
+        header = _HDR_CACHE.get(hdr_key)
+    if header is None:
+        try:
+            header = jwt.get_unverified_header(token)
+        except Exception:
+            raise _AuthError("Invalid token header")
+        with _HDR_CACHE_LOCK:
+            _HDR_CACHE[hdr_key] = header
+    return header
+
+
+def _lookup_key(kid):
+    """Chave RSA do índice JWKS; kid desconhecido força um refresh e retry."""
+    try:
+        _get_jwks()
+    except Exception as e:
+        logger.exception("Failed to fetch JWKS")
+        # Se JWKS falhar e já tivermos cache vazio — erro 500
+        raise _AuthError(f"Erro ao buscar JWKS: {str(e)}", 500)
+
+    rsa_key = _JWKS_CACHE["index"].get(kid)
+    if rsa_key is None:
+        # kid desconhecido normalmente é rotação de chave no Auth0:
+        # força um refresh do JWKS e tenta uma única vez de novo
+        try:
+            with _JWKS_LOCK:
+                _fetch_jwks()
+        except Exception as e:
+            logger.warning("Falha ao re-buscar JWKS para kid desconhecido: %s", e)
+        rsa_key = _JWKS_CACHE["index"].get(kid)
+    if rsa_key is None:
+        raise _AuthError("Appropriate JWK not found")
+    return rsa_key
+
+
+def _verify(token, rsa_key):
+    """Decodifica e valida o token; devolve o payload com _scopes_set."""
+    try:
+        payload = jwt.decode(
+            token,
+            rsa_key,
+            algorithms=ALGORITHMS,
+            audience=AUTH0_AUDIENCE,
+            issuer=ISSUER
+        )
+    except jwt.ExpiredSignatureError:
+        raise _AuthError("Token expired")
+    except jwt.InvalidAudienceError:
+        raise _AuthError("Audience inválida")
+    except jwt.InvalidIssuerError:
+        raise _AuthError("Issuer inválido")
+    except Exception as e:
+        logger.warning("Token validation error: %s", e)
+        raise _AuthError(f"Token inválido: {str(e)}")
+
+    # scopes parseados uma única vez por token; hits de cache só fazem o
+    # membership test no frozenset
+    scopes = payload.get("scope", "")
+    payload["_scopes_set"] = (
+        frozenset(scopes.split()) if isinstance(scopes, str) else frozenset()
+    )
+    return payload
+
+
+def _validate_bearer(token):
+    """Valida o token indo primeiro ao cache de payloads; levanta _AuthError."""
+    # Hit de cache: pula a verificação RSA inteira, só re-checa o exp.
+    # Margem de 30s: token perto de expirar volta pro caminho completo,
+    # que devolve o erro exato de expiração
+    cache_key = _token_cache_key(token)
+    with _TOKEN_CACHE_LOCK:
+        payload = _TOKEN_CACHE.get(cache_key)
+    if payload is not None and payload.get("exp", 0) > time.time() + 30:
+        return payload
+
+    payload = _verify(token, _lookup_key(_unverified_header(token).get("kid")))
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[cache_key] = payload
+    return payload
+
+
+def requires_auth_api(required_scope: str = None):
+    """
+    Decorator to require a Bearer access token (Auth0).
+    If required_scope is provided, also checks that scope exists in token.
+    Bypasses authentication when app.config['TESTING'] is True.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            # Bypass authentication in test mode
+            if current_app.config.get("TESTING"):
+                request.current_user = {"sub": "test-user"}
+                return f(*args, **kwargs)
+
+            try:
+                payload = _validate_bearer(_extract_bearer(request.headers.get("Authorization")))
+            except _AuthError as e:
+                return jsonify({"error": e.message}), e.status
+
+            # scope check (optional)
+            if required_scope and required_scope not in payload["_scopes_set"]:
+                return jsonify({"error": "Insufficient scope"}), 403
+
+            # attach claims
+            request.current_user = payload
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
@@ -0,0 +1,9 @@
+#!/bin/sh
+# Entrypoint de produção: gevent libera o worker durante I/O de Mongo/JWKS
+# e --reuse-port (SO_REUSEPORT) distribui accepts entre os processos.
+exec gunicorn -k gevent \
+  -w "${WEB_CONCURRENCY:-$(nproc)}" \
+  --worker-connections 1000 \
+  --bind "0.0.0.0:${PORT:-5000}" \
+  --reuse-port \
+  app:app
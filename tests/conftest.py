@@ -0,0 +1,68 @@
+import hashlib
+
+import pytest
+import mongomock
+
+from app import app as _flask_app, mongo as _mongo
+
+
+@pytest.fixture(scope="session")
+def app():
+    """A instância Flask, importada uma única vez por worker via conftest."""
+    return _flask_app
+
+
+@pytest.fixture(scope="session")
+def mongo(app):
+    """O wrapper PyMongo do app, para testes que mexem direto no banco."""
+    return _mongo
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _testing_mode():
+    """Liga o modo de teste uma vez por sessão.
+
+    O bypass de auth acontece dentro do próprio requires_auth_api, que
+    checa current_app.config["TESTING"] — não há monkeypatch por teste.
+    """
+    _flask_app.config["TESTING"] = True
+
+
+@pytest.fixture(scope="session")
+def mongo_client():
+    """Um único MongoClient do mongomock para a sessão inteira."""
+    return mongomock.MongoClient()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_db(mongo_client, request):
+    # Cada teste ganha um banco novo no client compartilhado: isolamento
+    # sem teardown (nada de delete_many varrendo a collection). O nome vem
+    # do nodeid do teste, então é estável entre execuções — útil para
+    # inspecionar o banco de um teste específico num post-mortem.
+    _mongo.cx = mongo_client
+    nome = hashlib.blake2b(request.node.nodeid.encode(), digest_size=8).hexdigest()
+    _mongo.db = mongo_client[f"tarefas_testdb_{nome}"]
+
+
+@pytest.fixture
+def make_tarefa():
+    """Fabrica tarefas inserindo direto no banco, sem pagar o POST HTTP."""
+    def _make(**overrides):
+        doc = {
+            "titulo": "Tarefa",
+            "descricao": "Descrição",
+            "concluida": False,
+            "owner": "test-user",
+        }
+        doc.update(overrides)
+        return str(_mongo.db.tarefas.insert_one(doc).inserted_id)
+    return _make
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Um test client para a sessão inteira; a API não usa cookies, então
+    não há estado de client a limpar entre testes."""
+    with _flask_app.test_client() as c:
+        yield c
@@ -1,29 +1,22 @@
 import pytest
-import mongomock
-import sys
-import os
-
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from app import app, mongo
-
-@pytest.fixture
-def client():
-    app.config["TESTING"] = True
-    
-    # Força mongo.db a usar mongomock (banco em memória)
-    mongo.cx = mongomock.MongoClient()
-    mongo.db = mongo.cx["tarefas_testdb"]
-
-    client = app.test_client()
-    yield client
-    # limpa depois dos testes
-    mongo.db.tarefas.delete_many({})
+
+# Todos os testes deste módulo compartilham o mongo.db global do app; o
+# grupo garante que rodem no mesmo worker do xdist mesmo que a distribuição
+# por módulo mude no futuro.
+pytestmark = pytest.mark.xdist_group(name="mongo_tarefas")
+
+# Payloads constantes montados uma vez no módulo; os handlers não mutam o
+# corpo recebido, então o mesmo dict pode ser reenviado por vários testes.
+_CRIAR_PAYLOAD = {"titulo": "Minha Tarefa", "descricao": "Conteúdo da tarefa"}
+_BULK_PAYLOAD = {"tarefas": [
+    {"titulo": "Lote 1", "descricao": "Primeira do lote"},
+    {"descricao": "Segunda do lote"},
+]}
+_ATUALIZAR_PAYLOAD = {"titulo": "Tarefa Atualizada", "descricao": "Novo conteúdo", "concluida": True}
+
 
 def test_criar_tarefa(client):
-    resposta = client.post(
-        "/tarefas",
-        json={"titulo": "Minha Tarefa", "descricao": "Conteúdo da tarefa"}
-    )
+    resposta = client.post("/tarefas", json=_CRIAR_PAYLOAD)
     assert resposta.status_code == 201
     assert resposta.json["titulo"] == "Minha Tarefa"
     assert resposta.json["concluida"] is False
@@ -35,28 +28,25 @@ def test_listar_tarefas(client):
     )
     resposta = client.get("/tarefas")
     assert resposta.status_code == 200
-    assert len(resposta.json) > 0
+    assert len(resposta.json["tarefas"]) > 0
+    assert resposta.json["next_cursor"] is None
 
-def test_atualizar_tarefa(client):
-    resposta = client.post(
-        "/tarefas",
-        json={"titulo": "Antiga Tarefa", "descricao": "Velho conteúdo"}
-    )
-    tarefa_id = resposta.json["id"]
-    update_res = client.put(
-        f"/tarefas/{tarefa_id}",
-        json={"titulo": "Tarefa Atualizada", "descricao": "Novo conteúdo", "concluida": True}
-    )
+def test_criar_tarefas_bulk(client):
+    resposta = client.post("/tarefas/bulk", json=_BULK_PAYLOAD)
+    assert resposta.status_code == 201
+    assert len(resposta.json["ids"]) == 2
+    listagem = client.get("/tarefas")
+    assert len(listagem.json["tarefas"]) == 2
+
+def test_atualizar_tarefa(client, make_tarefa):
+    tarefa_id = make_tarefa(titulo="Antiga Tarefa", descricao="Velho conteúdo")
+    update_res = client.put(f"/tarefas/{tarefa_id}", json=_ATUALIZAR_PAYLOAD)
     assert update_res.status_code == 200
     assert update_res.json["titulo"] == "Tarefa Atualizada"
     assert update_res.json["concluida"] is True
 
-def test_deletar_tarefa(client):
-    resposta = client.post(
-        "/tarefas",
-        json={"titulo": "Tarefa Apagar", "descricao": "Deletar depois"}
-    )
-    tarefa_id = resposta.json["id"]
+def test_deletar_tarefa(client, make_tarefa):
+    tarefa_id = make_tarefa(titulo="Tarefa Apagar", descricao="Deletar depois")
     delete_res = client.delete(f"/tarefas/{tarefa_id}")
     assert delete_res.status_code == 200
     assert delete_res.json["message"] == "Tarefa deletada com sucesso"